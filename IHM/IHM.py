@@ -13,11 +13,16 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 from Trajectory.generate_trajectory import generate_trajectory
+from Trajectory.route_loader import open_route, route_points, route_boundary
 from Model.vehicle_model import VehicleModel
+from Model.noise_model import NoiseModel, load_noise_config
 from Autopilot.autopilot import autopilot_step
 from Safety_mecanism.Safety_mecanism import safety_mecanism
+from Telemetry.telemetry_server import TelemetryServer, parse_port
 
 timeUpdate = 100 * 10**-3  # s
+telemetryPort = parse_port(os.environ.get("BEI_TELEMETRY_PORT"))  # Set to stream telemetry on localhost (0 = disabled)
+routeFile = os.environ.get("BEI_ROUTE_FILE")  # Optional CSV / GeoJSON / .route.npy route replacing the default trajectory
 
 class StarterCode(QWidget):
     def __init__(self):
@@ -33,6 +38,13 @@ class StarterCode(QWidget):
         self.ui = Interface()
         layout.addWidget(self.ui)
 
+        # Optional telemetry stream for external viewers and recorders
+        self.tick = 0
+        self.telemetry = None
+        if telemetryPort:
+            self.telemetry = TelemetryServer(port=telemetryPort)
+            self.telemetry.start()
+
         # Create a timer for periodic updates
         self.timer = QTimer(self)
 
@@ -55,8 +67,8 @@ class StarterCode(QWidget):
             speed, steering_angle, stop_message = safety_mecanism(
             True,
             self.ui.path,
-            self.ui.pos_x_temp,
-            self.ui.pos_y_temp,
+            self.ui.measured_x_temp,
+            self.ui.measured_y_temp,
             self.ui.theta_temp,
             self.ui.velocity_temp,
             self.ui.time,
@@ -71,7 +83,7 @@ class StarterCode(QWidget):
         # Autopilot mode activated (only if failure mode is deactivated)
         elif self.ui.autopilot_is_pushed:
             steering_angle = autopilot_step(
-                self.ui.pos_x_temp, self.ui.pos_y_temp, self.ui.path, self.ui.theta_temp, timeUpdate, speed
+                self.ui.measured_x_temp, self.ui.measured_y_temp, self.ui.path, self.ui.theta_temp, timeUpdate, speed
             )
             self.ui.steering_temp.append(steering_angle)
 
@@ -79,38 +91,66 @@ class StarterCode(QWidget):
         if self.ui.manual_mode:
             steering_angle = self.ui.manual_steering_angle
 
+        # Steering angle actually applied by the actuator (delay and lag)
+        steering_angle_applied = self.ui.noise_model.actuate_steering(steering_angle)
+
         # Update the position using VehicleModel
-        self.ui.vehicle_model.update_position(steering_angle, speed, timeUpdate)
+        self.ui.vehicle_model.update_position(steering_angle_applied, speed, timeUpdate)
 
         # Update variables used for display
         pos_x, pos_y, theta = self.ui.vehicle_model.get_position()
         self.ui.pos_x_temp.append(pos_x)
         self.ui.pos_y_temp.append(pos_y)
+        measured_x, measured_y = self.ui.noise_model.measure_position(pos_x, pos_y)
+        self.ui.measured_x_temp.append(measured_x)
+        self.ui.measured_y_temp.append(measured_y)
         self.ui.theta_temp.append(theta)
         self.ui.velocity_temp.append(speed)
         self.ui.steering_temp.append(steering_angle)
         # Compute the error between the calculated and applied steering angle
-        steering_angle_applied = self.ui.steering_temp[-1] if self.ui.steering_temp else 0
         steering_error = abs(steering_angle - steering_angle_applied)
 
         # 📝 Store the error in the list
         self.ui.steering_error_temp.append(steering_error)
 
+        # Publish the tick to telemetry subscribers (no-op without clients)
+        if self.telemetry:
+            # Simulation time from the tick count: self.ui.time is reset by the failure mode
+            self.telemetry.publish(self.tick, self.tick * timeUpdate, pos_x, pos_y, theta, steering_angle, speed, self.ui.failure_mode)
+        self.tick += 1
+
+    def closeEvent(self, event):
+        """Stop the telemetry server when the window is closed."""
+        if self.telemetry:
+            self.telemetry.stop()
+        super().closeEvent(event)
+
 class Interface(QWidget):
     def __init__(self):
         super().__init__()
 
-        # Generate the trajectory using wpimath
-        self.path, self.outer_left_boundary, self.middle_left_boundary, self.inner_left_boundary, self.right_boundary = generate_trajectory()
+        # Load an external route, or generate the trajectory using wpimath
+        if routeFile:
+            self.route = open_route(routeFile)  # Memory-mapped, shared between processes
+            self.path = route_points(self.route)  # (N, 2) view of the route, no copy
+            # Lane boundaries are computed on the first plot
+            self.outer_left_boundary = self.middle_left_boundary = self.inner_left_boundary = self.right_boundary = None
+        else:
+            self.path, self.outer_left_boundary, self.middle_left_boundary, self.inner_left_boundary, self.right_boundary = generate_trajectory()
 
 
         # Initialize the VehicleModel object
         self.vehicle_model = VehicleModel()  # Model to manage vehicle's position and orientation
 
+        # Sensor noise and actuator delay between the model and the controllers
+        self.noise_model = NoiseModel(load_noise_config() or {}, timeUpdate)
+
         # Temporary storage for plotting
         self.time = 0
         self.pos_x_temp = [0]  # Initial position of the vehicle
         self.pos_y_temp = [0]
+        self.measured_x_temp = [0]  # Positions seen by the controllers (with sensor noise)
+        self.measured_y_temp = [0]
         self.theta_temp = [0]  # Initial orientation
         self.steering_temp = []
         self.velocity_temp = []
@@ -322,11 +362,17 @@ class Interface(QWidget):
 
     def plot_path(self):
         """Plots the trajectory on the simulator."""
-        path_x, path_y = zip(*self.path)
-        outer_left_x, outer_left_y = zip(*self.outer_left_boundary)
-        middle_left_x, middle_left_y = zip(*self.middle_left_boundary)
-        inner_left_x, inner_left_y = zip(*self.inner_left_boundary)
-        right_x, right_y = zip(*self.right_boundary)
+        if self.outer_left_boundary is None:
+            self.outer_left_boundary = route_boundary(self.route, 3)
+            self.middle_left_boundary = route_boundary(self.route, 2)
+            self.inner_left_boundary = route_boundary(self.route, 1)
+            self.right_boundary = route_boundary(self.route, -1)
+
+        path_x, path_y = np.asarray(self.path).T
+        outer_left_x, outer_left_y = np.asarray(self.outer_left_boundary).T
+        middle_left_x, middle_left_y = np.asarray(self.middle_left_boundary).T
+        inner_left_x, inner_left_y = np.asarray(self.inner_left_boundary).T
+        right_x, right_y = np.asarray(self.right_boundary).T
 
         self.plot_simulator.plot(
             path_x, path_y,
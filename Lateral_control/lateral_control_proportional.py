@@ -11,7 +11,7 @@ def lateral_control_proportional(pos_x_temp, pos_y_temp, path):
     Proportional lateral controller to adjust the vehicle's steering angle based on the angular error.
     """
     # Verify that the trajectory and positions are valid
-    if not path or len(pos_x_temp) < 2 or len(pos_y_temp) < 2:
+    if len(path) == 0 or len(pos_x_temp) < 2 or len(pos_y_temp) < 2:
         return 0  # Not enough data to calculate the steering angle
 
     # Extracting the vehicle's last position
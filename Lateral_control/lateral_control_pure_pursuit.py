@@ -7,6 +7,7 @@
 import numpy as np
 import json
 import os
+from Lateral_control.pure_pursuit_cache import PurePursuitCache
 
 # Load Pure Pursuit control parameters from JSON
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "lateral_control_pure_pursuit_parameters.json")
@@ -37,6 +38,18 @@ default_speed = pure_pursuit_config["default_speed"]  # Default vehicle speed
 max_steering_angle = np.radians(pure_pursuit_config["max_steering_angle_deg"])  # Max steering angle in radians
 L = pure_pursuit_config["L"]  # Wheelbase of the vehicle (meters)
 
+# Per-path lookup tables (target index, curvature-scheduled gains), bounded LRU cache
+path_cache = PurePursuitCache(
+    max_bytes=int(pure_pursuit_config.get("cache_max_mb", 64) * 2**20),
+    max_build_distances=int(pure_pursuit_config.get("cache_max_build_distances", 10**8)),
+    lookahead_gain=Kdd,
+    min_lookahead=min_lookahead_distance,
+    max_lookahead=pure_pursuit_config.get("max_lookahead_distance", 10.0),
+    bucket_size=pure_pursuit_config.get("lookahead_bucket_size", 0.25),
+    curvature_gain=pure_pursuit_config.get("curvature_gain", 0.0),
+    gain_schedule=pure_pursuit_config.get("lookahead_gain_schedule"),
+)
+
 def lateral_control_pure_pursuit(pos_x_temp, pos_y_temp, path, speed=default_speed):
     """
     Pure Pursuit lateral control for calculating the steering angle.
@@ -44,36 +57,30 @@ def lateral_control_pure_pursuit(pos_x_temp, pos_y_temp, path, speed=default_spe
     Parameters:
         pos_x_temp (list): List of the vehicle's x positions.
         pos_y_temp (list): List of the vehicle's y positions.
-        path (list): List of (x, y) points representing the trajectory.
+        path (list): List of (x, y) points representing the trajectory, or an (N, 2) / route array.
         speed (float): Vehicle speed (m/s), default from config.
 
     Returns:
         float: Steering angle (radians).
     """
-    if not path or len(pos_x_temp) < 2 or len(pos_y_temp) < 2:
+    if len(path) == 0 or len(pos_x_temp) < 2 or len(pos_y_temp) < 2:
         return 0  # Not enough data to compute steering angle
 
     # Get current position
     current_pos = np.array([pos_x_temp[-1], pos_y_temp[-1]])
 
-    # Compute distances from current position to all path points
-    distances = [np.linalg.norm(current_pos - np.array(p)) for p in path]
+    # Get the lookup tables of this path (built in the background on first use)
+    tables = path_cache.get(path)
 
     # Find closest path point
-    closest_idx = np.argmin(distances)
-
-    # Compute lookahead distance based on speed
-    lookahead_distance = max(Kdd * speed, min_lookahead_distance)
+    closest_idx = tables.closest_index(current_pos[0], current_pos[1])
 
-    # Find the target point on the path within the lookahead distance
-    target_point = None
-    for i in range(closest_idx, len(path)):
-        if np.linalg.norm(np.array(path[i]) - current_pos) >= lookahead_distance:
-            target_point = np.array(path[i])
-            break
+    # Compute lookahead distance based on speed and path curvature
+    lookahead_distance = tables.lookahead_distance(closest_idx, speed)
 
-    if target_point is None:
-        target_point = np.array(path[-1])
+    # Find the target point on the path within the lookahead distance,
+    # starting the search from the lookup table when it is built
+    target_point = tables.points[tables.target_index(current_pos[0], current_pos[1], closest_idx, lookahead_distance)]
 
     # Compute vector to target
     path_vector = target_point - current_pos
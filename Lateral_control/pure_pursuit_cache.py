@@ -0,0 +1,288 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# pure_pursuit_cache.py
+
+import queue
+import threading
+from collections import OrderedDict
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+# Memory for the temporary arrays of a target table build, and their number per
+# (path point, window point) pair: offsets, distances and the running maximum
+BUILD_BUDGET_BYTES = 16 * 2**20
+BUILD_TEMPORARIES = 8
+
+def path_points(path):
+    """(N, 2) float array of a path: list of (x, y), (N, 2) array or route structured array (no copy for arrays)."""
+    if getattr(path, "dtype", None) is not None and path.dtype.names:
+        return structured_to_unstructured(path[["x", "y"]], copy=False)
+    return np.asarray(path, dtype=float).reshape(-1, 2)
+
+class PathTables:
+    """
+    Data precomputed once per path for Pure Pursuit.
+
+    gains[c] is the lookahead gain scheduled from the path curvature at c, and
+    targets[c, b] (once built) the index of the first path point after c that is
+    at least lookaheads[b] away from point c. The targets only give a safe start
+    index for the search, so the selected target point is the same with or
+    without them.
+    """
+
+    def __init__(self, path, lookahead_gain, min_lookahead, max_lookahead, bucket_size,
+                 curvature_gain=0.0, gain_schedule=None):
+        self.points = path_points(path)
+        self.min_lookahead = min_lookahead
+        self.bucket_size = bucket_size
+        self.lookaheads = min_lookahead + bucket_size * np.arange(
+            int(np.ceil((max(max_lookahead, min_lookahead) - min_lookahead) / bucket_size)) + 1
+        )
+        self.curvature = self._compute_curvature(self.points)
+        self.gains = lookahead_gain / (1.0 + curvature_gain * np.abs(self.curvature))
+
+        # Optional speed-dependent gain factor, interpolated from (speed, factor) pairs
+        if gain_schedule:
+            self.schedule_speeds, self.schedule_factors = np.asarray(gain_schedule, dtype=float).T
+        else:
+            self.schedule_speeds = self.schedule_factors = None
+
+        self.window = self._target_window(self.points, self.lookaheads[-1])
+        self.targets = None  # Built by PurePursuitCache, possibly in the background
+
+    @property
+    def nbytes(self):
+        targets_nbytes = self.targets.nbytes if self.targets is not None else 0
+        return self.points.nbytes + self.curvature.nbytes + self.gains.nbytes + targets_nbytes
+
+    @property
+    def targets_nbytes(self):
+        """Size of the target table once built."""
+        return len(self.points) * len(self.lookaheads) * np.dtype(np.int32).itemsize
+
+    @property
+    def build_distances(self):
+        """Number of point distances computed to build the target table."""
+        return len(self.points) * (self.window + 1)
+
+    def closest_index(self, x, y):
+        """Index of the path point closest to (x, y)."""
+        return int(np.argmin(self._distances(self.points, x, y)))
+
+    def lookahead_distance(self, closest_idx, speed):
+        """Lookahead distance scheduled on the curvature at closest_idx and on the speed."""
+        gain = self.gains[closest_idx]
+        if self.schedule_speeds is not None:
+            gain *= np.interp(speed, self.schedule_speeds, self.schedule_factors)
+        return max(gain * speed, self.min_lookahead)
+
+    def start_index(self, x, y, closest_idx, lookahead_distance):
+        """
+        Table lookup of an index before which no path point can be at lookahead_distance
+        from (x, y): by the triangle inequality, points closer than
+        lookahead_distance - |(x, y) - point c| to point c are too close to the vehicle.
+        """
+        targets = self.targets
+        if targets is None:
+            return closest_idx
+        closest_point = self.points[closest_idx]
+        bound = lookahead_distance - np.hypot(x - closest_point[0], y - closest_point[1]) - 1e-9
+        if bound < self.lookaheads[0]:
+            return closest_idx
+        bucket = min(int((bound - self.min_lookahead) / self.bucket_size), len(self.lookaheads) - 1)
+        if self.lookaheads[bucket] > bound:
+            bucket -= 1
+        return int(targets[closest_idx, bucket])
+
+    def target_index(self, x, y, closest_idx, lookahead_distance, chunk_size=16):
+        """
+        Index of the first path point from closest_idx at least lookahead_distance away
+        from (x, y), or the last point of the path if there is none.
+        """
+        n = len(self.points)
+        i = self.start_index(x, y, closest_idx, lookahead_distance)
+        while i < n:
+            segment = self.points[i:i + chunk_size]
+            distances = self._distances(segment, x, y)
+            reached = np.flatnonzero(distances >= lookahead_distance)
+            if reached.size:
+                return i + int(reached[0])
+            i += chunk_size
+            chunk_size *= 2
+        return n - 1
+
+    @staticmethod
+    def _distances(points, x, y):
+        # Same arithmetic as np.linalg.norm, so ties and thresholds match a per-point norm
+        dx = points[:, 0] - x
+        dy = points[:, 1] - y
+        return np.sqrt(dx * dx + dy * dy)
+
+    @staticmethod
+    def _compute_curvature(points):
+        if len(points) < 3:
+            return np.zeros(len(points))
+        dx = np.gradient(points[:, 0])
+        dy = np.gradient(points[:, 1])
+        ds = np.maximum(np.hypot(dx, dy), 1e-9)
+        heading = np.unwrap(np.arctan2(dy, dx))
+        return np.gradient(heading) / ds
+
+    @staticmethod
+    def _target_window(points, max_lookahead):
+        """Number of points after each point that the target table build looks at."""
+        n = len(points)
+        if n < 2:
+            return 1
+        # Euclidean distance never exceeds arc length, so look forward over twice
+        # the longest lookahead in arc length (at least one point)
+        s = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))))
+        window_end = np.searchsorted(s, s + 2 * max_lookahead, side="right")
+        return int(max(1, np.max(window_end - np.arange(n))))
+
+    @staticmethod
+    def _compute_targets(points, lookaheads, budget_bytes=BUILD_BUDGET_BYTES):
+        n = len(points)
+        targets = np.full((n, len(lookaheads)), n - 1, dtype=np.int32)
+        if n < 2:
+            return targets
+
+        # Rows per chunk so that the temporaries of a chunk fit in budget_bytes
+        window = PathTables._target_window(points, lookaheads[-1])
+        chunk_size = max(1, budget_bytes // (BUILD_TEMPORARIES * 8 * (window + 1)))
+
+        for start in range(0, n, chunk_size):
+            c = np.arange(start, min(start + chunk_size, n))
+            offsets = c[:, None] + np.arange(window + 1)[None, :]
+            valid = offsets < n
+            offsets = np.minimum(offsets, n - 1)
+            distances = np.hypot(points[offsets, 0] - points[c, 0, None], points[offsets, 1] - points[c, 1, None])
+            # The running maximum turns "first point at distance >= d" into a sorted search;
+            # shifting each row by a multiple of span searches all rows at once
+            reach = np.maximum.accumulate(np.where(valid, distances, -1.0), axis=1)
+            rows = np.arange(len(c))[:, None]
+            span = max(reach.max(), lookaheads[-1]) + 1.0
+            first = np.searchsorted((reach + rows * span).ravel(), lookaheads[None, :] + rows * span)
+            first -= rows * (window + 1)
+            found = first <= window
+            # Targets not found fall back to the furthest point of the window, which is
+            # still a valid start index since every point of the window is closer
+            targets[c] = np.where(found, offsets[rows, np.minimum(first, window)], offsets[:, -1:])
+        return targets
+
+
+class PurePursuitCache:
+    """
+    LRU cache of PathTables, bounded in memory.
+
+    Paths are looked up by identity first, then by content (the points as bytes),
+    so identical paths rebuilt every tick (e.g. the safety parking trajectory)
+    share the same tables. Paths are assumed not to be modified in place.
+    Target tables are built one at a time by a background worker thread when
+    `background` is set, and skipped for paths whose tables would not fit in
+    max_bytes or would take more than max_build_distances point distances to
+    build; the controller then searches the path from the closest point.
+    """
+
+    def __init__(self, max_bytes, max_build_distances=10**8, background=True, **table_parameters):
+        self.max_bytes = max_bytes
+        self.max_build_distances = max_build_distances
+        self.background = background
+        self.table_parameters = table_parameters
+        self._tables = OrderedDict()  # Points bytes -> PathTables
+        self._paths = {}  # id(path) -> (path, points bytes)
+        self._lock = threading.Lock()
+        self._builds = queue.Queue()  # (tables, key) waiting for the worker
+        self._worker = None
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._tables)
+
+    def get(self, path):
+        """Return the tables of a path; their targets may not be built yet."""
+        with self._lock:
+            known = self._paths.get(id(path))
+            if known is not None and known[0] is path and known[1] in self._tables:
+                key = known[1]
+            else:
+                key = path_points(path).tobytes()
+            tables = self._tables.get(key)
+            if tables is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+                tables = PathTables(path, **self.table_parameters)
+                self._tables[key] = tables
+                self.size_bytes += tables.nbytes + len(key)
+                self._schedule_build(tables, key)
+                self._evict()
+            if known is None or known[0] is not path:
+                self._forget_path(key)
+                self._paths[id(path)] = (path, key)
+        return tables
+
+    def wait(self):
+        """Wait for the pending background builds."""
+        self._builds.join()
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._paths.clear()
+            self.size_bytes = 0
+
+    def _schedule_build(self, tables, key):
+        if tables.nbytes + len(key) + tables.targets_nbytes > self.max_bytes:
+            print(f"Warning: Pure Pursuit lookup tables for a {len(tables.points)}-point path exceed "
+                  f"the {self.max_bytes / 2**20:.0f} MB cache limit, searching the path instead")
+            return
+        if tables.build_distances > self.max_build_distances:
+            print(f"Warning: Pure Pursuit lookup tables for a {len(tables.points)}-point path exceed "
+                  f"the build limit of {self.max_build_distances:.0e} point distances, searching the path instead")
+            return
+        if self.background:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name="pure-pursuit-tables", daemon=True)
+                self._worker.start()
+            self._builds.put((tables, key))
+        else:
+            self._store_targets(tables, key, PathTables._compute_targets(tables.points, tables.lookaheads))
+
+    def _work(self):
+        while True:
+            tables, key = self._builds.get()
+            try:
+                with self._lock:
+                    evicted = self._tables.get(key) is not tables
+                if not evicted:
+                    targets = PathTables._compute_targets(tables.points, tables.lookaheads)
+                    with self._lock:
+                        self._store_targets(tables, key, targets)
+            except Exception as error:
+                print(f"Error: Failed to build Pure Pursuit lookup tables: {error}")
+            finally:
+                self._builds.task_done()
+
+    def _store_targets(self, tables, key, targets):
+        if self._tables.get(key) is not tables:
+            return  # Evicted while building
+        tables.targets = targets
+        self.size_bytes += targets.nbytes
+        self._evict()
+
+    def _evict(self):
+        # Never evict the most recently used path
+        while self.size_bytes > self.max_bytes and len(self._tables) > 1:
+            key, evicted = self._tables.popitem(last=False)
+            self.size_bytes -= evicted.nbytes + len(key)
+            self._forget_path(key)
+
+    def _forget_path(self, key):
+        for path_id in [path_id for path_id, (_, path_key) in self._paths.items() if path_key == key]:
+            del self._paths[path_id]
@@ -0,0 +1,165 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# test_pure_pursuit_cache.py
+
+import threading
+import tracemalloc
+import numpy as np
+import Lateral_control.lateral_control_pure_pursuit as pure_pursuit
+from Lateral_control.lateral_control_pure_pursuit import lateral_control_pure_pursuit
+from Lateral_control.pure_pursuit_cache import PathTables, PurePursuitCache
+
+PARAMETERS = dict(lookahead_gain=0.5, min_lookahead=1.0, max_lookahead=5.0, bucket_size=0.25)
+
+def figure_eight(n=400):
+    t = np.linspace(0, 2 * np.pi, n)
+    return list(zip(10 * np.sin(t), 5 * np.sin(2 * t)))
+
+def baseline_pure_pursuit(pos_x_temp, pos_y_temp, path, speed):
+    """Pure Pursuit with the original per-tick linear scan from the vehicle position"""
+    current_pos = np.array([pos_x_temp[-1], pos_y_temp[-1]])
+    distances = [np.linalg.norm(current_pos - np.array(p)) for p in path]
+    closest_idx = np.argmin(distances)
+    lookahead_distance = max(pure_pursuit.Kdd * speed, pure_pursuit.min_lookahead_distance)
+    target_point = np.array(path[-1])
+    for i in range(closest_idx, len(path)):
+        if np.linalg.norm(np.array(path[i]) - current_pos) >= lookahead_distance:
+            target_point = np.array(path[i])
+            break
+    path_vector = target_point - current_pos
+    alpha = np.arctan2(path_vector[1], path_vector[0])
+    current_angle = np.arctan2(pos_y_temp[-1] - pos_y_temp[-2], pos_x_temp[-1] - pos_x_temp[-2])
+    angle_error = alpha - current_angle
+    angle_error = np.arctan2(np.sin(angle_error), np.cos(angle_error))
+    steering_angle = np.arctan((2 * pure_pursuit.L * np.sin(angle_error)) / lookahead_distance)
+    return max(-pure_pursuit.max_steering_angle, min(pure_pursuit.max_steering_angle, steering_angle))
+
+def test_controller_matches_baseline_scan():
+    """Test que le contrôleur avec tables donne le même braquage que le parcours linéaire depuis le véhicule"""
+    path = figure_eight(300)
+    pure_pursuit.path_cache.get(path)
+    pure_pursuit.path_cache.wait()
+    assert pure_pursuit.path_cache.get(path).targets is not None
+
+    rng = np.random.default_rng(0)
+    points = np.array(path)
+    for _ in range(500):
+        x, y = points[rng.integers(len(points))] + rng.normal(0.0, 1.5, 2)
+        heading = rng.uniform(-np.pi, np.pi)
+        pos_x = [x - 0.1 * np.cos(heading), x]
+        pos_y = [y - 0.1 * np.sin(heading), y]
+        speed = rng.uniform(0.0, 80.0)
+        assert lateral_control_pure_pursuit(pos_x, pos_y, path, speed) == baseline_pure_pursuit(pos_x, pos_y, path, speed)
+
+def test_targets_match_linear_scan():
+    """Test que la table donne le premier point à distance de chaque point du chemin"""
+    path = figure_eight()
+    tables = PathTables(path, **PARAMETERS)
+    targets = PathTables._compute_targets(tables.points, tables.lookaheads)
+    points = np.array(path)
+    for closest_idx in range(0, len(path), 7):
+        for b, lookahead in enumerate(tables.lookaheads):
+            expected = len(path) - 1
+            for i in range(closest_idx, len(path)):
+                if np.linalg.norm(points[i] - points[closest_idx]) >= lookahead:
+                    expected = i
+                    break
+            assert targets[closest_idx, b] == expected
+
+def test_curvature_reduces_lookahead():
+    """Test de la réduction de l'anticipation dans les virages"""
+    path = figure_eight()
+    tables = PathTables(path, curvature_gain=5.0, **PARAMETERS)
+    straight = int(np.argmin(np.abs(tables.curvature)))
+    curve = int(np.argmax(np.abs(tables.curvature)))
+    assert tables.lookahead_distance(curve, 6.0) < tables.lookahead_distance(straight, 6.0)
+
+def test_speed_gain_schedule():
+    """Test du gain d'anticipation en fonction de la vitesse"""
+    path = [(x, 0.0) for x in range(0, 20)]
+    tables = PathTables(path, gain_schedule=[[0.0, 1.0], [10.0, 0.5]], **PARAMETERS)
+    assert np.isclose(tables.lookahead_distance(0, 4.0), 0.5 * 0.8 * 4.0)
+    assert tables.lookahead_distance(0, 0.1) == PARAMETERS["min_lookahead"]
+
+def test_cache_hit_on_equal_content():
+    """Test du cache pour deux trajectoires identiques reconstruites"""
+    cache = PurePursuitCache(max_bytes=2**20, background=False, **PARAMETERS)
+    path = figure_eight()
+    first = cache.get(path)
+    assert cache.get(path) is first  # Same list
+    assert cache.get(figure_eight()) is first  # Same content, new list
+    assert cache.hits == 2 and cache.misses == 1
+    assert first.targets is not None
+
+def test_background_builds_share_one_worker():
+    """Test que les constructions en arrière-plan passent par un seul thread"""
+    threads = threading.active_count()
+    cache = PurePursuitCache(max_bytes=2**22, **PARAMETERS)
+    paths = [[(x + k, y) for x, y in figure_eight()] for k in range(5)]
+    for path in paths:
+        cache.get(path)
+    assert threading.active_count() == threads + 1
+    cache.wait()
+    assert all(cache.get(path).targets is not None for path in paths)
+
+def test_cache_distinguishes_content():
+    """Test que deux trajectoires différentes de même longueur ne partagent pas leurs tables"""
+    cache = PurePursuitCache(max_bytes=2**20, background=False, **PARAMETERS)
+    first = cache.get(figure_eight())
+    second = cache.get([(x + 1.0, y) for x, y in figure_eight()])
+    assert first is not second
+    assert cache.misses == 2
+
+def test_cache_eviction():
+    """Test de l'éviction LRU lorsque la mémoire est dépassée"""
+    cache = PurePursuitCache(max_bytes=2**20, background=False, **PARAMETERS)
+    cache.get(figure_eight())
+    size = cache.size_bytes
+    cache = PurePursuitCache(max_bytes=2 * size, background=False, **PARAMETERS)
+    paths = [[(x + k, y) for x, y in figure_eight()] for k in range(3)]
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])  # paths[1] becomes the least recently used
+    cache.get(paths[2])
+    assert len(cache) == 2
+    assert cache.size_bytes <= cache.max_bytes
+    cache.get(paths[0])
+    assert cache.hits == 2
+
+def test_oversized_path_is_not_rebuilt(capsys):
+    """Test qu'un chemin trop grand pour le cache n'est construit qu'une fois, sans table"""
+    cache = PurePursuitCache(max_bytes=20000, background=False, **PARAMETERS)
+    path = figure_eight()
+    tables = cache.get(path)
+    assert tables.targets is None
+    assert "exceed" in capsys.readouterr().out
+    assert cache.get(path) is tables
+    assert cache.misses == 1
+    # Without tables the search starts from the closest point and gives the same target
+    built = PurePursuitCache(max_bytes=2**20, background=False, **PARAMETERS).get(path)
+    x, y = 1.0, 0.5
+    closest_idx = tables.closest_index(x, y)
+    assert tables.target_index(x, y, closest_idx, 3.0) == built.target_index(x, y, closest_idx, 3.0)
+
+def test_long_build_is_skipped(capsys):
+    """Test qu'un chemin dont la construction des tables serait trop longue est parcouru sans table"""
+    path = figure_eight()
+    cache = PurePursuitCache(max_bytes=2**20, max_build_distances=len(path), background=False, **PARAMETERS)
+    tables = cache.get(path)
+    assert tables.build_distances > len(path)
+    assert tables.targets is None
+    assert "build limit" in capsys.readouterr().out
+
+def test_build_memory_is_bounded():
+    """Test que la construction par blocs respecte le budget mémoire et donne la même table"""
+    path = figure_eight(2000)
+    tables = PathTables(path, **PARAMETERS)
+    budget = 64 * 1024
+    tracemalloc.start()
+    targets = PathTables._compute_targets(tables.points, tables.lookaheads, budget_bytes=budget)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < targets.nbytes + 2 * budget
+    assert np.array_equal(targets, PathTables._compute_targets(tables.points, tables.lookaheads))
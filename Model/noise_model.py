@@ -0,0 +1,148 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# noise_model.py
+
+import json
+import os
+import numpy as np
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "noise_model_parameters.json")
+
+def load_noise_config(config_path=CONFIG_PATH):
+    """Load sensor noise and actuator delay parameters from a JSON file."""
+    try:
+        with open(config_path, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        print(f"Error: Configuration file not found at {config_path}")
+        return None
+    except json.JSONDecodeError:
+        print(f"Error: Failed to decode JSON from {config_path}")
+        return None
+
+class PositionNoise:
+    """
+    Gaussian position noise with occasional GPS jumps.
+
+    A jump is a position offset that persists over the following ticks, shrinking
+    by `jump_decay` each tick, until it fades out or the next jump replaces it.
+    Noise is pre-sampled in blocks from a seeded numpy Generator, so a tick only
+    reads one row of the block. Works on one vehicle (scalars) or a fleet (arrays).
+    """
+
+    def __init__(self, std=0.0, jump_probability=0.0, jump_std=0.0, jump_decay=0.0, n_vehicles=1,
+                 block_size=1024, rng=None):
+        self.std = std
+        self.jump_probability = jump_probability
+        self.jump_std = jump_std
+        self.jump_decay = jump_decay
+        self.n_vehicles = n_vehicles
+        self.block_size = block_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._block = None
+        self._index = block_size
+        self._jump_offset = np.zeros((2, n_vehicles))  # Offset carried over from the previous block
+
+    def _sample_block(self):
+        shape = (self.block_size, 2, self.n_vehicles)
+        block = self.rng.normal(0.0, self.std, shape) if self.std > 0 else np.zeros(shape)
+        if self.jump_probability > 0:
+            block += self._jump_offsets(shape)
+        self._block = block
+        self._index = 0
+
+    def _jump_offsets(self, shape):
+        """
+        Offsets of the block: offset[t] = jump[t] at a jump, decay * offset[t - 1] otherwise,
+        computed from the index of the last jump instead of a per-tick loop.
+        """
+        jumps = self.rng.random((shape[0], 1, shape[2])) < self.jump_probability
+        values = self.rng.normal(0.0, self.jump_std, shape)
+        ticks = np.arange(shape[0])[:, None, None]
+        last_jump = np.maximum.accumulate(np.where(jumps, ticks, -1), axis=0)
+        since_jump = ticks - last_jump  # Ticks since the last jump, counted from tick -1 without any
+        decay = self.jump_decay ** since_jump
+        offsets = np.where(
+            last_jump >= 0,
+            np.take_along_axis(values, np.broadcast_to(np.maximum(last_jump, 0), shape), axis=0) * decay,
+            self._jump_offset * decay,
+        )
+        self._jump_offset = offsets[-1]
+        return offsets
+
+    def apply(self, x, y):
+        """Return the measured (x, y) of the true position(s)."""
+        if self._index >= self.block_size:
+            self._sample_block()
+        dx, dy = self._block[self._index]
+        self._index += 1
+        if np.ndim(x) == 0:
+            return x + dx[0], y + dy[0]
+        return x + dx, y + dy
+
+class SteeringActuator:
+    """
+    Steering actuator with a transport delay and a first-order lag.
+
+    Commands go through a fixed ring buffer of `delay_steps` ticks, then the
+    applied angle follows the delayed command with time constant `lag_time_constant`.
+    """
+
+    def __init__(self, time_update, delay_steps=0, lag_time_constant=0.0, n_vehicles=1):
+        self.delay_steps = delay_steps
+        self.alpha = time_update / (lag_time_constant + time_update)  # Discrete first-order lag gain
+        self.n_vehicles = n_vehicles
+        self._buffer = np.zeros((delay_steps + 1, n_vehicles))
+        self._head = 0
+        self._state = np.zeros(n_vehicles)
+
+    def reset(self):
+        self._buffer[:] = 0.0
+        self._state[:] = 0.0
+
+    def apply(self, steering_command):
+        """Push a steering command and return the angle applied by the actuator."""
+        self._buffer[self._head] = steering_command
+        self._head = (self._head + 1) % len(self._buffer)
+        delayed = self._buffer[self._head]  # Oldest command: written delay_steps ticks ago
+        self._state += self.alpha * (delayed - self._state)
+        if np.ndim(steering_command) == 0:
+            return float(self._state[0])
+        return self._state.copy()
+
+class NoiseModel:
+    """Noise and delay layer between the vehicle model and the controllers."""
+
+    def __init__(self, config, time_update, n_vehicles=1):
+        self.enabled = config.get("enabled", False)
+        rng = np.random.default_rng(config.get("seed"))
+        jump_time_constant = config.get("gps_jump_time_constant", 0.0)
+        self.position_noise = PositionNoise(
+            std=config.get("position_std", 0.0),
+            jump_probability=config.get("gps_jump_probability", 0.0),
+            jump_std=config.get("gps_jump_std", 0.0),
+            jump_decay=np.exp(-time_update / jump_time_constant) if jump_time_constant > 0 else 0.0,
+            n_vehicles=n_vehicles,
+            block_size=config.get("block_size", 1024),
+            rng=rng,
+        )
+        self.steering_actuator = SteeringActuator(
+            time_update,
+            delay_steps=int(round(config.get("steering_delay", 0.0) / time_update)),
+            lag_time_constant=config.get("steering_lag_time_constant", 0.0),
+            n_vehicles=n_vehicles,
+        )
+
+    def measure_position(self, x, y):
+        """Position seen by the controllers."""
+        if not self.enabled:
+            return x, y
+        return self.position_noise.apply(x, y)
+
+    def actuate_steering(self, steering_command):
+        """Steering angle actually applied to the vehicle."""
+        if not self.enabled:
+            return steering_command
+        return self.steering_actuator.apply(steering_command)
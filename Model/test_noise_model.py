@@ -0,0 +1,70 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# test_noise_model.py
+
+import numpy as np
+from Model.noise_model import PositionNoise, SteeringActuator, NoiseModel, load_noise_config
+
+def test_noise_is_reproducible():
+    """Test de reproductibilité du bruit avec une graine"""
+    first = PositionNoise(std=0.1, jump_probability=0.1, jump_std=1.0, block_size=16, rng=np.random.default_rng(3))
+    second = PositionNoise(std=0.1, jump_probability=0.1, jump_std=1.0, block_size=16, rng=np.random.default_rng(3))
+    samples_first = [first.apply(0.0, 0.0) for _ in range(50)]  # Spans several blocks
+    samples_second = [second.apply(0.0, 0.0) for _ in range(50)]
+    assert samples_first == samples_second
+    assert isinstance(samples_first[0][0], float)
+
+def test_noise_statistics():
+    """Test de l'écart type du bruit de position"""
+    noise = PositionNoise(std=0.2, rng=np.random.default_rng(0))
+    samples = np.array([noise.apply(1.0, 2.0) for _ in range(5000)])
+    assert np.allclose(samples.mean(axis=0), [1.0, 2.0], atol=0.02)
+    assert np.allclose(samples.std(axis=0), 0.2, rtol=0.05)
+
+def test_gps_jump_persists():
+    """Test qu'un saut GPS est un décalage qui persiste et décroît sur plusieurs ticks"""
+    noise = PositionNoise(jump_probability=0.02, jump_std=5.0, jump_decay=0.9, block_size=16, rng=np.random.default_rng(1))
+    offsets = np.array([noise.apply(0.0, 0.0) for _ in range(500)])  # Spans several blocks
+    new_jump = ~np.isclose(offsets[1:], 0.9 * offsets[:-1]).all(axis=1)
+    assert 0 < new_jump.sum() < 25  # Only the jumps break the decay
+    assert np.mean(np.abs(offsets[:, 0]) > 0.1) > 0.3  # Offsets last over many ticks
+
+def test_gps_jump_without_decay_is_an_outlier():
+    """Test qu'un saut sans décroissance ne dure qu'un tick"""
+    noise = PositionNoise(jump_probability=0.1, jump_std=5.0, rng=np.random.default_rng(1))
+    offsets = np.array([noise.apply(0.0, 0.0) for _ in range(500)])
+    jumped = np.abs(offsets[:, 0]) > 0
+    assert 0 < jumped.sum() < 100
+    assert not np.any(jumped[1:] & jumped[:-1] & (offsets[1:, 0] == offsets[:-1, 0]))
+
+def test_fleet_noise():
+    """Test du bruit pour une flotte de véhicules"""
+    noise = PositionNoise(std=0.1, n_vehicles=4, rng=np.random.default_rng(0))
+    x, y = noise.apply(np.zeros(4), np.ones(4))
+    assert x.shape == y.shape == (4,)
+    assert len(set(x)) == 4
+
+def test_transport_delay():
+    """Test du retard pur de l'actionneur de direction"""
+    actuator = SteeringActuator(0.1, delay_steps=3)
+    applied = [actuator.apply(command) for command in [1.0, 2.0, 3.0, 4.0, 5.0]]
+    assert applied == [0.0, 0.0, 0.0, 1.0, 2.0]
+
+def test_actuator_lag():
+    """Test du premier ordre de l'actionneur de direction"""
+    actuator = SteeringActuator(0.1, lag_time_constant=0.3, n_vehicles=2)
+    for _ in range(100):
+        applied = actuator.apply(np.array([0.5, -0.5]))
+    assert np.allclose(applied, [0.5, -0.5], atol=1e-6)
+    actuator.reset()
+    assert 0 < actuator.apply(np.array([0.5, 0.5]))[0] < 0.5
+
+def test_disabled_model_is_transparent():
+    """Test que le modèle désactivé ne modifie rien"""
+    config = load_noise_config()
+    config["enabled"] = False
+    model = NoiseModel(config, 0.1)
+    assert model.measure_position(1.0, 2.0) == (1.0, 2.0)
+    assert model.actuate_steering(0.3) == 0.3
@@ -0,0 +1,295 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# profiler.py
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from Lateral_control.lateral_control_pure_pursuit import path_cache
+from Profiling.scenario import CONTROLLERS, load_scenario_path, run_scenario
+
+SUMMARY_FILE = "profile_summary.json"
+PREVIOUS_SUMMARY_FILE = "profile_summary.previous.json"
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stack of one thread at a fixed interval.
+    Stacks are counted in collapsed format ("root;caller;function") for flame graphs.
+    """
+
+    def __init__(self, interval=0.001, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks = Counter()
+        self._running = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._running.set()
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+        self._thread.join()
+
+    def _sample(self):
+        while self._running.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+def collapsed_from_cprofile(stats):
+    """
+    Approximate collapsed stacks from the cProfile call graph (caller;callee edges
+    weighted by own time in microseconds), used when the sampler is disabled.
+    """
+    stacks = Counter()
+    for (filename, _, name), (_, _, tottime, _, callers) in stats.stats.items():
+        function = f"{os.path.basename(filename)}:{name}"
+        total_calls = sum(caller[1] for caller in callers.values()) or 1
+        if not callers:
+            stacks[function] += int(tottime * 1e6)
+        for (caller_file, _, caller_name), caller_stats in callers.items():
+            # Split own time between callers in proportion to their number of calls
+            share = tottime * caller_stats[1] / total_calls
+            stacks[f"{os.path.basename(caller_file)}:{caller_name};{function}"] += int(share * 1e6)
+    return stacks
+
+def write_collapsed(stacks, file_path):
+    """Write stacks in collapsed format, readable by flamegraph.pl or speedscope."""
+    with open(file_path, "w") as file:
+        for stack, count in stacks.most_common():
+            if count > 0:
+                file.write(f"{stack} {count}\n")
+
+def top_functions(stats, limit=20):
+    """Functions with the highest own time."""
+    functions = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        functions.append({
+            "function": f"{os.path.basename(filename)}:{line}:{name}",
+            "ncalls": ncalls,
+            "tottime": tottime,
+            "cumtime": cumtime,
+        })
+    functions.sort(key=lambda function: function["tottime"], reverse=True)
+    return functions[:limit]
+
+def top_allocations(snapshot, limit=20):
+    """Allocation sites holding the most memory in a tracemalloc snapshot."""
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),  # Sampler and summary bookkeeping
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+    return [
+        {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "size": stat.size, "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+def compare_summaries(previous, current):
+    """
+    Compare a profile summary against a previous one.
+
+    Runs of different scenarios or with different profiling settings (tracemalloc
+    and the sampler add their own overhead) are not compared.
+
+    Returns:
+        dict: Relative change of the time per tick and own time changes of the top functions,
+              or the differing settings when the runs are not comparable.
+    """
+    def relative(old, new):
+        return (new - old) / old if old else None
+
+    differences = [
+        f"{section}.{name}: {previous.get(section, {}).get(name)!r} -> {current[section][name]!r}"
+        for section in ("scenario", "settings")
+        for name in current[section]
+        if previous.get(section, {}).get(name) != current[section][name]
+    ]
+    if differences:
+        return {"comparable": False, "differences": differences}
+
+    previous_functions = {function["function"]: function for function in previous.get("top_functions", [])}
+    functions = []
+    for function in current.get("top_functions", []):
+        old = previous_functions.get(function["function"])
+        functions.append({
+            "function": function["function"],
+            "tottime": function["tottime"],
+            "previous_tottime": old["tottime"] if old else None,
+            "change": relative(old["tottime"], function["tottime"]) if old else None,
+        })
+    comparison = {
+        "comparable": True,
+        "time_per_tick_change": relative(previous["time_per_tick"], current["time_per_tick"]),
+        "functions": functions,
+    }
+    if "peak_memory" in previous and "peak_memory" in current:
+        comparison["peak_memory_change"] = relative(previous["peak_memory"], current["peak_memory"])
+    return comparison
+
+def profile_scenario(output_dir, route=None, controller="pure_pursuit", duration=60.0, failure_time=None,
+                     noise=False, sampling=False, sampling_interval=0.001, trace_memory=False, compare=None):
+    """
+    Run a scenario under cProfile (and optionally the sampling profiler and tracemalloc)
+    and write the profile files to output_dir.
+
+    Files:
+        profile.prof           cProfile statistics (pstats / snakeviz)
+        profile.collapsed      collapsed stacks for flame graphs
+        profile_summary.json   time per tick, top functions, top allocations, comparison
+
+    Parameters:
+        compare (str): Summary to compare against. Defaults to the summary already present
+                       in output_dir, which is kept as profile_summary.previous.json once
+                       the new summary is written.
+
+    Returns:
+        dict: Summary of the run.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    summary_path = os.path.join(output_dir, SUMMARY_FILE)
+    if compare is None and os.path.exists(summary_path):
+        compare = summary_path
+
+    # Load the path outside of the measured run
+    path = load_scenario_path(route)
+
+    # The Pure Pursuit tables are normally built on a background thread that the profilers
+    # do not watch: build them in the measured thread, from an empty cache so that every
+    # run pays the same table builds
+    path_cache.clear()
+    background = path_cache.background
+    path_cache.background = False
+
+    sampler = SamplingProfiler(sampling_interval) if sampling else None
+    if trace_memory:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    if sampler:
+        sampler.start()
+    try:
+        start = time.perf_counter()
+        profiler.enable()
+        result = run_scenario(path, controller, duration, failure_time, noise=noise)
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+    except BaseException:
+        profiler.disable()
+        if trace_memory:
+            tracemalloc.stop()
+        raise
+    finally:
+        if sampler:
+            sampler.stop()
+        path_cache.background = background
+
+    summary = {
+        "scenario": {
+            "route": route,
+            "controller": controller,
+            "duration": duration,
+            "failure_time": failure_time,
+            "noise": noise,
+            "path_points": len(path),
+        },
+        "settings": {
+            "sampling": sampling,
+            "sampling_interval": sampling_interval if sampling else None,
+            "trace_memory": trace_memory,
+        },
+        "ticks": result["ticks"],
+        "elapsed": elapsed,
+        "time_per_tick": elapsed / max(result["ticks"], 1),
+    }
+
+    if trace_memory:
+        snapshot = tracemalloc.take_snapshot()
+        summary["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        summary["top_allocations"] = top_allocations(snapshot)
+        tracemalloc.stop()
+
+    profiler.dump_stats(os.path.join(output_dir, "profile.prof"))
+    stats = pstats.Stats(profiler)
+    summary["top_functions"] = top_functions(stats)
+    stacks = sampler.stacks if sampler else collapsed_from_cprofile(stats)
+    write_collapsed(stacks, os.path.join(output_dir, "profile.collapsed"))
+
+    if compare and os.path.exists(compare):
+        with open(compare, "r") as file:
+            summary["comparison"] = compare_summaries(json.load(file), summary)
+
+    # Keep the last summary as the previous one only once the new one is written
+    with open(summary_path + ".tmp", "w") as file:
+        json.dump(summary, file, indent=4)
+    if os.path.exists(summary_path):
+        os.replace(summary_path, os.path.join(output_dir, PREVIOUS_SUMMARY_FILE))
+    os.replace(summary_path + ".tmp", summary_path)
+    return summary
+
+def print_summary(summary):
+    scenario = summary["scenario"]
+    print(f"Scenario: {scenario['controller']} on {scenario['route'] or 'default trajectory'} "
+          f"({scenario['path_points']} points), {scenario['duration']} s, failure at {scenario['failure_time']}")
+    print(f"{summary['ticks']} ticks in {summary['elapsed']:.3f} s ({summary['time_per_tick'] * 1e6:.1f} us/tick)")
+    if "peak_memory" in summary:
+        print(f"Peak traced memory: {summary['peak_memory'] / 1024:.1f} KiB")
+    print("\nTop functions (own time):")
+    for function in summary["top_functions"][:10]:
+        print(f"  {function['tottime']:8.4f} s  {function['ncalls']:>8}  {function['function']}")
+    if summary.get("top_allocations"):
+        print("\nTop allocation sites:")
+    for allocation in summary.get("top_allocations", [])[:10]:
+        print(f"  {allocation['size'] / 1024:8.1f} KiB  {allocation['site']}")
+    comparison = summary.get("comparison")
+    if comparison and not comparison["comparable"]:
+        print("\nWarning: not compared with the previous profile, the runs differ:")
+        for difference in comparison["differences"]:
+            print(f"  {difference}")
+    elif comparison and comparison["time_per_tick_change"] is not None:
+        print(f"\nTime per tick vs previous profile: {comparison['time_per_tick_change'] * 100:+.1f} %")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile a headless simulation run.")
+    parser.add_argument("--route", help="CSV / GeoJSON / .route.npy route (default: wpimath trajectory)")
+    parser.add_argument("--controller", choices=CONTROLLERS, default="pure_pursuit")
+    parser.add_argument("--duration", type=float, default=60.0, help="Simulated duration (s)")
+    parser.add_argument("--failure-time", type=float, help="Inject an ECU failure at this time (s)")
+    parser.add_argument("--noise", action="store_true", help="Enable the sensor noise and actuator delay layer")
+    parser.add_argument("--sampling", action="store_true", help="Build flame graph stacks with the sampling profiler")
+    parser.add_argument("--sampling-interval", type=float, default=0.001, help="Sampling interval (s)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Record the top allocation sites")
+    parser.add_argument("--compare", help="Previous profile_summary.json to compare against")
+    parser.add_argument("--output", default="Profiles", help="Output directory")
+    args = parser.parse_args(argv)
+
+    summary = profile_scenario(
+        args.output,
+        route=args.route,
+        controller=args.controller,
+        duration=args.duration,
+        failure_time=args.failure_time,
+        noise=args.noise,
+        sampling=args.sampling,
+        sampling_interval=args.sampling_interval,
+        trace_memory=args.tracemalloc,
+        compare=args.compare,
+    )
+    print_summary(summary)
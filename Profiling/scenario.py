@@ -0,0 +1,98 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# scenario.py
+
+from Model.vehicle_model import VehicleModel
+from Model.noise_model import NoiseModel, load_noise_config
+from Autopilot.autopilot import autopilot_step
+from Lateral_control.lateral_control_proportional import lateral_control_proportional
+from Safety_mecanism.Safety_mecanism import safety_mecanism
+
+CONTROLLERS = ("pure_pursuit", "proportional")
+
+def load_scenario_path(route=None):
+    """
+    Path of the scenario: the (N, 2) positions of an external route file, mapped
+    without copy, or the default wpimath trajectory.
+    """
+    if route:
+        from Trajectory.route_loader import open_route, route_points
+        return route_points(open_route(route))
+    from Trajectory.generate_trajectory import generate_trajectory  # Needs wpimath
+    return generate_trajectory()[0]
+
+def run_scenario(path, controller="pure_pursuit", duration=60.0, failure_time=None, time_update=0.1,
+                 speed=1.0, noise=False):
+    """
+    Headless equivalent of the StarterCode loop (without the Qt timer and plots).
+
+    Parameters:
+        path (list): List of (x, y) points representing the trajectory, or an (N, 2) array.
+        controller (str): Lateral controller, "pure_pursuit" or "proportional".
+        duration (float): Simulated duration (s).
+        failure_time (float): Time of the ECU failure injection (s), None for no failure.
+        time_update (float): Time step of the simulation (s).
+        speed (float): Vehicle speed outside failure mode (m/s).
+        noise (bool): Insert the sensor noise and actuator delay layer.
+
+    Returns:
+        dict: Number of ticks, final position and failure stop time.
+    """
+    if controller not in CONTROLLERS:
+        raise ValueError(f"Unknown controller '{controller}', expected one of {CONTROLLERS}")
+
+    vehicle_model = VehicleModel()
+    noise_config = load_noise_config() or {}
+    noise_config["enabled"] = noise
+    noise_model = NoiseModel(noise_config, time_update)
+
+    pos_x_temp, pos_y_temp, theta_temp = [0], [0], [0]
+    measured_x_temp, measured_y_temp = [0], [0]
+    # Start at cruise speed, as the IHM has already driven when a failure can be toggled
+    velocity_temp, steering_temp = [speed], []
+    failure_mode = False
+    failure_clock = 0.0
+    stop_time = None
+    ticks = int(round(duration / time_update))
+
+    for tick in range(ticks):
+        time = tick * time_update
+        if failure_time is not None and not failure_mode and time >= failure_time:
+            failure_mode = True
+            failure_clock = 0.0  # The safety mechanism counts time from the failure
+
+        if failure_mode:
+            failure_clock += time_update
+            current_speed, steering_angle, stop_message = safety_mecanism(
+                True, path, measured_x_temp, measured_y_temp, theta_temp, velocity_temp, failure_clock, time_update
+            )
+            if stop_message and stop_time is None:
+                stop_time = time
+        elif controller == "pure_pursuit":
+            current_speed = speed
+            steering_angle = autopilot_step(measured_x_temp, measured_y_temp, path, theta_temp, time_update, speed)
+        else:
+            current_speed = speed
+            steering_angle = lateral_control_proportional(measured_x_temp, measured_y_temp, path)
+            theta_temp.append(theta_temp[-1] + steering_angle * time_update)
+
+        steering_angle_applied = noise_model.actuate_steering(steering_angle)
+        vehicle_model.update_position(steering_angle_applied, current_speed, time_update)
+
+        pos_x, pos_y, theta = vehicle_model.get_position()
+        pos_x_temp.append(pos_x)
+        pos_y_temp.append(pos_y)
+        measured_x, measured_y = noise_model.measure_position(pos_x, pos_y)
+        measured_x_temp.append(measured_x)
+        measured_y_temp.append(measured_y)
+        theta_temp.append(theta)
+        velocity_temp.append(current_speed)
+        steering_temp.append(steering_angle)
+
+    return {
+        "ticks": ticks,
+        "final_position": (pos_x_temp[-1], pos_y_temp[-1]),
+        "stop_time": stop_time,
+    }
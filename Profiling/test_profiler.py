@@ -0,0 +1,96 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# test_profiler.py
+
+import json
+import os
+import pstats
+import pytest
+from Profiling.profiler import profile_scenario, compare_summaries, PREVIOUS_SUMMARY_FILE
+from Profiling.scenario import run_scenario
+
+PATH = [(x * 0.5, 0.0) for x in range(0, 200)]
+
+def write_route(tmp_path):
+    source = tmp_path / "straight.csv"
+    source.write_text("x,y\n" + "".join(f"{x},{y}\n" for x, y in PATH))
+    return str(source)
+
+def test_scenario_with_failure():
+    """Test d'un scénario sans interface avec injection de défaillance"""
+    result = run_scenario(PATH, duration=10.0, failure_time=2.0)
+    assert result["ticks"] == 100
+    assert result["stop_time"] is not None and result["stop_time"] > 2.0
+
+def test_failure_at_start():
+    """Test d'une défaillance injectée dès le départ"""
+    for failure_time in (0.0, -1.0):
+        result = run_scenario(PATH, duration=10.0, failure_time=failure_time)
+        assert result["stop_time"] == 5.0  # Stopped 5 s after the failure
+
+def test_unknown_controller():
+    """Test de contrôleur inconnu"""
+    with pytest.raises(ValueError):
+        run_scenario(PATH, controller="stanley")
+
+def test_profile_files_and_comparison(tmp_path):
+    """Test des fichiers de profilage et de la comparaison avec le profil précédent"""
+    output = tmp_path / "profiles"
+    route = write_route(tmp_path)
+    profile_scenario(str(output), route=route, duration=2.0, sampling=True)
+    summary = profile_scenario(str(output), route=route, duration=2.0, sampling=True)
+
+    for name in ("profile.prof", "profile.collapsed", "profile_summary.json", PREVIOUS_SUMMARY_FILE):
+        assert os.path.exists(output / name)
+    assert summary["comparison"]["comparable"]
+    assert summary["comparison"]["time_per_tick_change"] is not None
+    with open(output / "profile_summary.json") as file:
+        assert json.load(file)["ticks"] == 20
+    with open(output / "profile.collapsed") as file:
+        stack, count = file.readline().rsplit(" ", 1)
+        assert int(count) > 0
+
+def test_table_builds_are_profiled(tmp_path):
+    """Test que la construction des tables Pure Pursuit est mesurée à chaque profilage"""
+    output = tmp_path / "profiles"
+    route = write_route(tmp_path)
+    for _ in range(2):
+        profile_scenario(str(output), route=route, duration=2.0)
+        stats = pstats.Stats(str(output / "profile.prof"))
+        assert any(name == "_compute_targets" for _, _, name in stats.stats)
+
+def test_different_runs_are_not_compared(tmp_path):
+    """Test que des scénarios ou réglages différents ne sont pas comparés"""
+    output = tmp_path / "profiles"
+    route = write_route(tmp_path)
+    profile_scenario(str(output), route=route, duration=2.0)
+    summary = profile_scenario(str(output), route=route, duration=2.0, controller="proportional")
+    assert not summary["comparison"]["comparable"]
+    assert any("controller" in difference for difference in summary["comparison"]["differences"])
+    summary = profile_scenario(str(output), route=route, duration=2.0, controller="proportional", trace_memory=True)
+    assert summary["comparison"]["differences"] == ["settings.trace_memory: False -> True"]
+
+def test_failed_run_keeps_last_summary(tmp_path):
+    """Test qu'un profilage en échec ne perd pas le dernier résumé"""
+    output = tmp_path / "profiles"
+    route = write_route(tmp_path)
+    profile_scenario(str(output), route=route, duration=2.0)
+    with open(output / "profile_summary.json") as file:
+        last_summary = file.read()
+    with pytest.raises(ValueError):
+        profile_scenario(str(output), route=route, duration=2.0, controller="stanley", trace_memory=True)
+    with open(output / "profile_summary.json") as file:
+        assert file.read() == last_summary
+    assert not os.path.exists(output / PREVIOUS_SUMMARY_FILE)
+
+def test_compare_summaries():
+    """Test du calcul des écarts entre deux profils"""
+    settings = {"scenario": {"controller": "pure_pursuit"}, "settings": {"trace_memory": False}}
+    previous = dict(settings, time_per_tick=2.0, top_functions=[{"function": "f", "tottime": 1.0}])
+    current = dict(settings, time_per_tick=1.0, top_functions=[{"function": "f", "tottime": 0.5}, {"function": "g", "tottime": 0.1}])
+    comparison = compare_summaries(previous, current)
+    assert comparison["time_per_tick_change"] == -0.5
+    assert comparison["functions"][0]["change"] == -0.5
+    assert comparison["functions"][1]["change"] is None
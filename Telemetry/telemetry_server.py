@@ -0,0 +1,226 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# telemetry_server.py
+
+import asyncio
+import socket
+import struct
+import threading
+from collections import deque
+
+# Binary frame sent for every published tick (little-endian, 37 bytes):
+# tick (uint32), time (float32), x (float64), y (float64), theta (float32),
+# steering (float32), speed (float32), failure (uint8)
+# time is the simulation time since start (s); it never goes backwards, even
+# when the failure mode resets the interface clock
+FRAME_FORMAT = "<IfddfffB"
+FRAME_SIZE = struct.calcsize(FRAME_FORMAT)
+
+# Subscription request a client may send right after connecting:
+# decimation factor (uint16), i.e. receive one frame every N ticks
+SUBSCRIBE_FORMAT = "<H"
+SUBSCRIBE_SIZE = struct.calcsize(SUBSCRIBE_FORMAT)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5555
+
+
+def parse_port(value, name="BEI_TELEMETRY_PORT"):
+    """
+    Parse a telemetry port setting: empty or "0" disables telemetry.
+
+    Returns:
+        int: Port number, 0 if disabled.
+    """
+    value = (value or "").strip()
+    if not value:
+        return 0
+    try:
+        port = int(value)
+    except ValueError:
+        port = -1
+    if not 0 <= port <= 65535:
+        raise RuntimeError(f"Invalid {name} '{value}': expected a port number between 1 and 65535, or 0 to disable telemetry.")
+    return port
+
+
+def pack_frame(tick, time, x, y, theta, steering, speed, failure):
+    """Pack one tick of vehicle state into a binary telemetry frame."""
+    return struct.pack(FRAME_FORMAT, tick & 0xFFFFFFFF, time, x, y, theta, steering, speed, 1 if failure else 0)
+
+
+def unpack_frame(data):
+    """
+    Decode a binary telemetry frame.
+
+    Returns:
+        dict: tick, time, x, y, theta, steering, speed and failure of the frame.
+    """
+    tick, time, x, y, theta, steering, speed, failure = struct.unpack(FRAME_FORMAT, data)
+    return {
+        "tick": tick,
+        "time": time,
+        "x": x,
+        "y": y,
+        "theta": theta,
+        "steering": steering,
+        "speed": speed,
+        "failure": bool(failure),
+    }
+
+
+class _Client:
+    """State of one subscribed viewer: its decimation factor and pending frames."""
+
+    def __init__(self, writer, decimation, queue_size):
+        self.writer = writer
+        self.decimation = max(1, decimation)
+        self.frames = deque(maxlen=queue_size)  # Oldest frames are dropped when the viewer lags
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+
+class TelemetryServer:
+    """
+    Local TCP server streaming per-tick vehicle state to external viewers.
+
+    The asyncio loop runs in its own daemon thread so that publishing from the
+    control tick only costs one struct.pack and a thread-safe callback. Slow
+    viewers never block the simulation: each one has a bounded queue and the
+    oldest frames are discarded when it is full.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, queue_size=64, subscribe_timeout=0.2):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.subscribe_timeout = subscribe_timeout
+        self._clients = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def start(self):
+        """Start the server thread and wait until it is listening."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="telemetry-server", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._server is None:
+            self._thread = None
+            raise RuntimeError(f"Failed to start telemetry server on {self.host}:{self.port}")
+
+    def stop(self):
+        """Close every client connection and stop the server thread."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self._started.clear()
+
+    def publish(self, tick, time, x, y, theta, steering, speed, failure):
+        """
+        Publish the state of one simulation tick to every connected viewer.
+        Safe to call from any thread; returns immediately.
+        """
+        if not self._clients:
+            return  # Nobody listening, skip packing entirely
+        frame = pack_frame(tick, time, x, y, theta, steering, speed, failure)
+        self._loop.call_soon_threadsafe(self._broadcast, tick, frame)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port)
+            )
+        except OSError:
+            self._server = None
+            self._started.set()
+            self._loop.close()
+            return
+        # Report the real port when an ephemeral one (0) was requested
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            for client in list(self._clients):
+                client.writer.close()
+            self._clients.clear()
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._loop.close()
+
+    def _broadcast(self, tick, frame):
+        for client in self._clients:
+            if tick % client.decimation:
+                continue
+            if len(client.frames) == client.frames.maxlen:
+                client.dropped += 1
+            client.frames.append(frame)
+            client.ready.set()
+
+    async def _handle_client(self, reader, writer):
+        # Read the optional subscription request, default to every tick
+        decimation = 1
+        try:
+            request = await asyncio.wait_for(reader.readexactly(SUBSCRIBE_SIZE), self.subscribe_timeout)
+            decimation = struct.unpack(SUBSCRIBE_FORMAT, request)[0]
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+
+        client = _Client(writer, decimation, self.queue_size)
+        self._clients.add(client)
+        try:
+            while not writer.is_closing():
+                await client.ready.wait()
+                client.ready.clear()
+                batch = b"".join(client.frames)
+                client.frames.clear()
+                writer.write(batch)
+                await writer.drain()  # Backpressure: wait for the socket, frames pile up in the bounded queue
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(client)
+            writer.close()
+
+
+def subscribe(host=DEFAULT_HOST, port=DEFAULT_PORT, decimation=1, timeout=None):
+    """
+    Connect to a telemetry server and yield decoded frames.
+
+    Parameters:
+        host (str): Server address.
+        port (int): Server port.
+        decimation (int): Receive one frame every `decimation` ticks.
+        timeout (float): Socket timeout in seconds, None to block.
+
+    Yields:
+        dict: Decoded frame (see unpack_frame).
+    """
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(struct.pack(SUBSCRIBE_FORMAT, max(1, decimation)))
+        buffer = b""
+        while True:
+            chunk = sock.recv(FRAME_SIZE * 64)
+            if not chunk:
+                return
+            buffer += chunk
+            while len(buffer) >= FRAME_SIZE:
+                yield unpack_frame(buffer[:FRAME_SIZE])
+                buffer = buffer[FRAME_SIZE:]
@@ -0,0 +1,81 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# test_telemetry_server.py
+
+import socket
+import threading
+import time
+import pytest
+from Telemetry.telemetry_server import TelemetryServer, pack_frame, unpack_frame, subscribe, parse_port, FRAME_SIZE
+
+@pytest.fixture
+def server():
+    server = TelemetryServer(port=0)
+    server.start()
+    yield server
+    server.stop()
+
+def wait_for_clients(server, count):
+    deadline = time.monotonic() + 2.0
+    while server.client_count < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert server.client_count == count
+
+def test_frame_round_trip():
+    """Test d'encodage / décodage d'une trame"""
+    frame = pack_frame(42, 4.2, 1.5, -2.5, 0.25, -0.1, 1.0, True)
+    assert len(frame) == FRAME_SIZE
+    decoded = unpack_frame(frame)
+    assert decoded["tick"] == 42
+    assert decoded["x"] == 1.5 and decoded["y"] == -2.5
+    assert decoded["failure"] is True
+
+def test_parse_port():
+    """Test de la lecture du port de télémétrie"""
+    assert parse_port(None) == 0
+    assert parse_port("") == 0
+    assert parse_port(" 5555 ") == 5555
+    for value in ("abc", "-1", "70000"):
+        with pytest.raises(RuntimeError, match="BEI_TELEMETRY_PORT"):
+            parse_port(value)
+
+def test_publish_without_clients(server):
+    """Test de publication sans abonné"""
+    server.publish(0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, False)
+    assert server.client_count == 0
+
+def test_client_downsampling(server):
+    """Test du sous-échantillonnage côté client"""
+    frames = subscribe(port=server.port, decimation=5, timeout=2.0)
+    received = []
+
+    def publish_ticks():
+        wait_for_clients(server, 1)
+        for tick in range(20):
+            server.publish(tick, tick * 0.1, float(tick), 0.0, 0.0, 0.0, 1.0, False)
+
+    # The generator connects lazily, so start it before publishing
+    publisher = threading.Thread(target=publish_ticks)
+    publisher.start()
+    for frame in frames:
+        received.append(frame["tick"])
+        if len(received) == 4:
+            break
+    publisher.join()
+    frames.close()
+    assert received == [0, 5, 10, 15]
+
+def test_slow_client_does_not_block(server):
+    """Test de contre-pression : un client lent ne bloque pas la publication"""
+    sock = socket.create_connection(("127.0.0.1", server.port))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+    try:
+        wait_for_clients(server, 1)
+        start = time.monotonic()
+        for tick in range(50000):
+            server.publish(tick, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, False)
+        assert time.monotonic() - start < 5.0
+    finally:
+        sock.close()
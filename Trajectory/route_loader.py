@@ -0,0 +1,281 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# route_loader.py
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Record stored for every route point in the binary route file
+ROUTE_DTYPE = np.dtype([
+    ("x", "<f8"),            # Position (meters)
+    ("y", "<f8"),
+    ("s", "<f8"),            # Arc length from the first point (meters)
+    ("heading", "<f8"),      # Path direction (radians)
+    ("curvature", "<f8"),    # Signed curvature (1/meters)
+    ("lane_offset", "<f8"),  # Distance from the path to the lane boundaries (meters)
+])
+
+ROUTE_EXTENSION = ".route.npy"
+EARTH_RADIUS = 6371000.0  # meters
+
+def load_waypoints(file_path, geographic=None):
+    """
+    Read waypoints from a CSV or GeoJSON file.
+
+    Parameters:
+        file_path (str): CSV file with x, y (and optionally lane_offset) columns,
+                         or GeoJSON file with LineString / MultiLineString geometries.
+        geographic (bool): Whether coordinates are longitude / latitude and must be
+                           projected to meters. Defaults to True for GeoJSON files.
+
+    Returns:
+        tuple: (points, lane_offsets) where points is an (N, 2) array and
+               lane_offsets an (N,) array or None if not given by the file.
+    """
+    file_path = os.fspath(file_path)
+    extension = os.path.splitext(file_path)[1].lower()
+    geographic = _resolve_geographic(file_path, geographic)
+    if extension in (".geojson", ".json"):
+        points = _read_geojson(file_path)
+        lane_offsets = None
+    elif extension == ".csv":
+        points, lane_offsets = _read_csv(file_path)
+    else:
+        raise ValueError(f"Unsupported route file format: {file_path}")
+
+    if geographic:
+        points = _project_lon_lat(points)
+
+    # Drop consecutive duplicates, they would give an undefined heading
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(np.diff(points, axis=0) != 0, axis=1)
+    points = points[keep]
+    if lane_offsets is not None:
+        lane_offsets = lane_offsets[keep]
+
+    if len(points) < 2:
+        raise ValueError(f"Route {file_path} needs at least two distinct waypoints")
+    return points, lane_offsets
+
+def _read_csv(file_path):
+    with open(file_path, "r") as file:
+        first_line = file.readline()
+    header = [name.strip().lower() for name in first_line.split(",")]
+    try:
+        [float(value) for value in header]
+        columns = {"x": 0, "y": 1}
+        skiprows = 0
+    except ValueError:
+        columns = {name: i for i, name in enumerate(header)}
+        skiprows = 1
+        if "x" not in columns or "y" not in columns:
+            raise ValueError(f"CSV route {file_path} must have 'x' and 'y' columns")
+
+    usecols = [columns["x"], columns["y"]]
+    if "lane_offset" in columns:
+        usecols.append(columns["lane_offset"])
+    data = np.loadtxt(file_path, delimiter=",", skiprows=skiprows, usecols=usecols, ndmin=2)
+    lane_offsets = data[:, 2] if data.shape[1] == 3 else None
+    return data[:, :2], lane_offsets
+
+def _read_geojson(file_path):
+    with open(file_path, "r") as file:
+        data = json.load(file)
+
+    if data.get("type") == "FeatureCollection":
+        geometries = [feature["geometry"] for feature in data["features"]]
+    elif data.get("type") == "Feature":
+        geometries = [data["geometry"]]
+    else:
+        geometries = [data]
+
+    lines = []
+    for geometry in geometries:
+        if geometry["type"] == "LineString":
+            lines.append(geometry["coordinates"])
+        elif geometry["type"] == "MultiLineString":
+            lines.extend(geometry["coordinates"])
+    if not lines:
+        raise ValueError(f"GeoJSON route {file_path} contains no LineString")
+    return np.concatenate([np.asarray(line, dtype=float)[:, :2] for line in lines])
+
+def _project_lon_lat(points):
+    """Equirectangular projection around the first point, accurate enough for depot-scale routes."""
+    lon = np.radians(points[:, 0])
+    lat = np.radians(points[:, 1])
+    x = EARTH_RADIUS * (lon - lon[0]) * np.cos(lat[0])
+    y = EARTH_RADIUS * (lat - lat[0])
+    return np.column_stack((x, y))
+
+def compute_route(points, lane_offsets=None, lane_offset=1.0, out=None):
+    """
+    Compute arc length, heading and curvature of a route.
+
+    Parameters:
+        points (ndarray): (N, 2) array of positions.
+        lane_offsets (ndarray): Per-point lane offsets, or None to use `lane_offset`.
+        lane_offset (float): Constant lane offset (meters).
+        out (ndarray): Optional ROUTE_DTYPE array of length N to fill in place.
+
+    Returns:
+        ndarray: ROUTE_DTYPE structured array.
+    """
+    route = np.empty(len(points), dtype=ROUTE_DTYPE) if out is None else out
+    x = points[:, 0]
+    y = points[:, 1]
+    route["x"] = x
+    route["y"] = y
+
+    segment_lengths = np.hypot(np.diff(x), np.diff(y))
+    s = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+    route["s"] = s
+
+    # Heading from central differences, as in generate_trajectory
+    heading = np.unwrap(np.arctan2(np.gradient(y), np.gradient(x)))
+    route["heading"] = np.arctan2(np.sin(heading), np.cos(heading))
+    route["curvature"] = np.gradient(heading, s)
+    route["lane_offset"] = lane_offset if lane_offsets is None else lane_offsets
+    return route
+
+def _resolve_geographic(file_path, geographic):
+    if geographic is None:
+        return os.path.splitext(file_path)[1].lower() in (".geojson", ".json")
+    return bool(geographic)
+
+def _conversion_path(route_path):
+    """Sidecar file recording the parameters a route file was converted with."""
+    return os.path.splitext(route_path)[0] + ".json"
+
+@contextmanager
+def _conversion_lock(route_path):
+    """Exclusive lock shared by every process converting or opening route_path."""
+    with open(os.path.splitext(route_path)[0] + ".lock", "a+b") as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _is_converted(route_path, source_path, conversion):
+    """Whether route_path is newer than its source and its sidecar matches both the parameters and the file."""
+    try:
+        route_mtime = os.stat(route_path).st_mtime_ns
+        if route_mtime < os.stat(source_path).st_mtime_ns:
+            return False
+        with open(_conversion_path(route_path), "r") as file:
+            recorded = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+    return recorded == dict(conversion, route_mtime=route_mtime)
+
+def _write_temp(route_path, suffix):
+    # Each process writes its own temporary file next to the route
+    fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=os.path.dirname(os.path.abspath(route_path)))
+    os.close(fd)
+    return temp_path
+
+def _convert(source_path, route_path, lane_offset, geographic):
+    # Called with the conversion lock held
+    conversion = {"source": os.path.abspath(source_path), "lane_offset": lane_offset, "geographic": geographic}
+    if _is_converted(route_path, source_path, conversion):
+        return
+
+    points, lane_offsets = load_waypoints(source_path, geographic)
+
+    # Write to temporary files first so readers never see a half-written route
+    temp_path = _write_temp(route_path, ".npy.tmp")
+    conversion_temp_path = _write_temp(route_path, ".json.tmp")
+    try:
+        route = np.lib.format.open_memmap(temp_path, mode="w+", dtype=ROUTE_DTYPE, shape=(len(points),))
+        compute_route(points, lane_offsets, lane_offset, out=route)
+        route.flush()
+        del route
+        # The sidecar names the route file it describes (by its modification time), so a
+        # route published without its sidecar is never taken for an up-to-date conversion
+        with open(conversion_temp_path, "w") as file:
+            json.dump(dict(conversion, route_mtime=os.stat(temp_path).st_mtime_ns), file, indent=4)
+        os.replace(temp_path, route_path)
+        os.replace(conversion_temp_path, _conversion_path(route_path))
+    finally:
+        for path in (temp_path, conversion_temp_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+def _source_and_route_paths(source_path, route_path):
+    source_path = os.fspath(source_path)
+    if route_path is None:
+        route_path = os.path.splitext(source_path)[0] + ROUTE_EXTENSION
+    return source_path, os.fspath(route_path)
+
+def convert_route(source_path, route_path=None, lane_offset=1.0, geographic=None):
+    """
+    Convert a CSV / GeoJSON route into a memory-mappable binary route file.
+    The conversion is skipped when the binary file is newer than its source and
+    was converted with the same parameters. Processes converting the same route
+    at the same time wait for the first one instead of converting it again.
+
+    Returns:
+        str: Path of the binary route file.
+    """
+    source_path, route_path = _source_and_route_paths(source_path, route_path)
+    with _conversion_lock(route_path):
+        _convert(source_path, route_path, lane_offset, _resolve_geographic(source_path, geographic))
+    return route_path
+
+def open_route(route_path, lane_offset=1.0, geographic=None):
+    """
+    Open a binary route file without copying it into memory, converting a
+    CSV / GeoJSON source first (see convert_route for the conversion parameters).
+    Processes opening the same file share its pages through the OS cache.
+
+    Returns:
+        memmap: Read-only ROUTE_DTYPE array.
+    """
+    route_path = os.fspath(route_path)
+    if route_path.endswith(ROUTE_EXTENSION):
+        route = np.load(route_path, mmap_mode="r")
+    else:
+        source_path, route_path = _source_and_route_paths(route_path, None)
+        # Map the file under the lock so that another conversion cannot replace it in between
+        with _conversion_lock(route_path):
+            _convert(source_path, route_path, lane_offset, _resolve_geographic(source_path, geographic))
+            route = np.load(route_path, mmap_mode="r")
+    if route.dtype != ROUTE_DTYPE:
+        raise ValueError(f"{route_path} is not a route file")
+    return route
+
+def route_points(route):
+    """(N, 2) view of the route positions, without copying the route."""
+    return structured_to_unstructured(route[["x", "y"]], copy=False)
+
+def route_boundary(route, lanes):
+    """
+    Path shifted to the left by `lanes` lane offsets (negative to the right),
+    as the boundaries returned by generate_trajectory (3, 2, 1 and -1 lanes).
+
+    Returns:
+        ndarray: (N, 2) array of the boundary points.
+    """
+    shift = lanes * route["lane_offset"]
+    return np.column_stack((route["x"] - np.sin(route["heading"]) * shift,
+                            route["y"] + np.cos(route["heading"]) * shift))
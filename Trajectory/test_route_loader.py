@@ -0,0 +1,105 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# test_route_loader.py
+
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from Trajectory.route_loader import convert_route, open_route, route_points, route_boundary, load_waypoints, ROUTE_EXTENSION
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def write_circle_csv(file_path, radius=10.0, n=2000, header=True):
+    angles = np.linspace(0, np.pi, n)
+    with open(file_path, "w") as file:
+        if header:
+            file.write("x,y,lane_offset\n")
+        for a in angles:
+            file.write(f"{radius * np.cos(a)},{radius * np.sin(a)},1.5\n")
+
+def test_csv_route_geometry(tmp_path):
+    """Test de la géométrie d'une route circulaire (abscisse, cap, courbure)"""
+    source = tmp_path / "circle.csv"
+    write_circle_csv(source)
+    route = open_route(convert_route(str(source)))
+    assert isinstance(route, np.memmap)
+    assert np.isclose(route["s"][-1], np.pi * 10.0, rtol=1e-3)
+    assert np.allclose(route["curvature"][5:-5], 0.1, rtol=1e-2)
+    assert np.isclose(route["heading"][0], np.pi / 2, atol=1e-2)
+    assert np.all(route["lane_offset"] == 1.5)
+
+def test_csv_without_header(tmp_path):
+    """Test d'un CSV sans en-tête"""
+    source = tmp_path / "line.csv"
+    source.write_text("0,0\n1,0\n1,0\n2,0\n")
+    points, lane_offsets = load_waypoints(str(source))
+    assert points.shape == (3, 2)  # Duplicate point removed
+    assert lane_offsets is None
+
+def test_conversion_is_cached(tmp_path):
+    """Test que la conversion n'est faite qu'une fois"""
+    source = tmp_path / "circle.csv"
+    write_circle_csv(source)
+    route_path = convert_route(str(source))
+    assert route_path.endswith(ROUTE_EXTENSION)
+    mtime = (tmp_path / "circle.route.npy").stat().st_mtime_ns
+    assert convert_route(str(source)) == route_path
+    assert (tmp_path / "circle.route.npy").stat().st_mtime_ns == mtime
+
+def test_geojson_projection(tmp_path):
+    """Test de la projection d'une route GeoJSON en mètres"""
+    source = tmp_path / "route.geojson"
+    source.write_text(json.dumps({
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "geometry": {
+            "type": "LineString", "coordinates": [[1.0, 43.0], [1.0, 43.001], [1.001, 43.001]]}}],
+    }))
+    route = open_route(source)  # pathlib.Path accepted
+    path = route_points(route)
+    assert np.shares_memory(path, route)
+    assert tuple(path[0]) == (0.0, 0.0)
+    assert np.isclose(path[1][1], 111.19, atol=0.1)  # 0.001° of latitude
+    right = route_boundary(route, -1)
+    assert right.shape == path.shape == (3, 2)
+    assert np.allclose(right[0], [1.0, 0.0])  # Heading north at the start, right boundary one lane to the east
+
+def test_unsupported_format(tmp_path):
+    """Test de format de fichier non supporté"""
+    source = tmp_path / "route.txt"
+    source.write_text("0 0\n")
+    with pytest.raises(ValueError):
+        load_waypoints(str(source))
+
+def test_conversion_parameters_change(tmp_path):
+    """Test que la route est reconvertie si les paramètres de conversion changent"""
+    source = tmp_path / "line.csv"
+    source.write_text("x,y\n0,0\n1,0\n2,0\n")
+    route = open_route(source, lane_offset=1.0)
+    assert np.all(route["lane_offset"] == 1.0)
+    route = open_route(source, lane_offset=2.0)
+    assert np.all(route["lane_offset"] == 2.0)
+    assert open_route(convert_route(source, lane_offset=2.0))["lane_offset"][0] == 2.0
+
+def test_concurrent_conversion(tmp_path):
+    """Test de l'ouverture simultanée d'une même route par plusieurs processus"""
+    source = tmp_path / "circle.csv"
+    write_circle_csv(source, n=100000)
+    script = ("import sys; from Trajectory.route_loader import open_route; "
+              "route = open_route(sys.argv[1]); print(len(route), route['lane_offset'][-1])")
+    processes = [
+        subprocess.Popen([sys.executable, "-c", script, str(source)], cwd=ROOT,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        for _ in range(6)
+    ]
+    for process in processes:
+        out, err = process.communicate(timeout=120)
+        assert process.returncode == 0, err.decode()
+        assert out.split() == [b"100000", b"1.5"]
+    # No temporary file left behind
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "circle.csv", "circle.route.json", "circle.route.lock", "circle.route.npy"]
@@ -0,0 +1,10 @@
+####################################################################
+#                       BEI EasyMile                               #
+#   Moez CHAGRAOUI, Rayen YADIR, Yassine ABDELILLAH, Drissa SAGNON #
+####################################################################
+# main_profile.py
+
+from Profiling.profiler import main
+
+if __name__ == "__main__":
+    main()